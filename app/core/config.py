@@ -18,7 +18,14 @@ class Settings(BaseSettings):
     FAILED_DIR: Path = DATA_DIR / "failed"
 
     # Database
-    DATABASE_URL: str = "sqlite:///./data/pdfproc.db"
+    DATABASE_URL: str = "sqlite+aiosqlite:///./data/pdfproc.db"
+
+    # Job Queue (ARQ / Redis)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    WORKER_MAX_JOBS: int = 10  # Concurrent jobs per worker process
+    # PyMuPDF processes per worker; total is this x number of workers.
+    # Set explicitly: os.cpu_count() reports host cores, not the container's quota.
+    PDF_POOL_WORKERS: int = 2
 
     # AI Provider Selection
     # Change LLM_PROVIDER in .env to "anthropic" to switch
@@ -32,9 +39,26 @@ class Settings(BaseSettings):
 
     # API Keys (Loaded from .env)
     OPENAI_API_KEY: str | None = None
+    ANTHROPIC_API_KEY: str | None = None
+
+    # LLM HTTP Client (shared per process)
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    LLM_TIMEOUT_SECONDS: float = 30.0
 
     # Processing Settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_UPLOAD_OVERHEAD: int = 64 * 1024  # Allowance for multipart headers/boundaries in the request body
+    UPLOAD_CHUNK_SIZE: int = 4 * 1024 * 1024  # 4MB: one write syscall per chunk when saving uploads
+
+    # Extraction Cache (keyed by PDF content hash)
+    CACHE_MAX_ENTRIES: int = 256  # Process-local entries per worker
+    CACHE_TTL_SECONDS: int = 3600
+
+    # Tier 2 Page Rendering
+    RENDER_ZOOM: float = 1.5  # ~150 DPI, still readable for invoice fonts
+    RENDER_JPEG_QUALITY: int = 85
+    RENDER_GRAYSCALE: bool = True  # 1 channel instead of 3: smaller and faster to encode
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -1,15 +1,35 @@
-from sqlmodel import create_engine, Session, SQLModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 
 # The engine is the central connection point to your SQLite database
-# 'check_same_thread=False' is required for SQLite to work with FastAPI's async nature
-engine = create_engine(
+# The 'aiosqlite' driver keeps database I/O off the event loop
+# A real pool lets readers (job polling) and the worker's writes use separate connections
+engine = create_async_engine(
     settings.DATABASE_URL, 
     echo=settings.DEBUG, 
-    connect_args={"check_same_thread": False}
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=20,
 )
 
-def init_db():
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tunes every new SQLite connection.
+    WAL lets readers proceed while a writer is active, avoiding 'database is locked' stalls.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+async def init_db():
     """
     Creates the database file and all tables defined in your schemas.
     This is called when the application starts up.
@@ -19,13 +39,21 @@ def init_db():
     from app.models import schemas 
     _ = schemas  # This line tells the linter the import is intentional
     
-    SQLModel.metadata.create_all(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+def new_session() -> AsyncSession:
+    """
+    Opens a session outside of a request (e.g., in queue workers).
+    Objects stay usable after commit, since async sessions cannot lazily refresh them.
+    """
+    return AsyncSession(engine, expire_on_commit=False)
 
-def get_session():
+async def get_session():
     """
     A 'dependency' function for FastAPI.
     It opens a new database session for a request and ensures it is closed
     after the request is finished.
     """
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    async with new_session() as session:
+        yield session
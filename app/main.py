@@ -1,20 +1,26 @@
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy import desc
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pathlib import Path
-import shutil
+from typing import Optional
 import uuid
+import hashlib
+import aiofiles
+from arq import create_pool
+from arq.connections import RedisSettings
+from cachetools import LRUCache, TTLCache
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import settings
 from app.db.session import init_db, get_session
-from app.models.schemas import Job, JobStatus, Invoice
-from app.services.ai.cascade import CascadeService
-from app.services.pdf.processor import PDFService
-from app.services.normalizer import CompanyNormalizer
+from app.models.schemas import Job, JobStatus
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -27,130 +33,154 @@ STATIC_DIR.mkdir(exist_ok=True)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initializes the database on startup."""
+    """Initializes the database and the job queue connection on startup."""
     logger.info("Starting up PDFProc v.2...")
-    init_db()
+    await init_db()
+    app.state.redis = await create_pool(RedisSettings.from_dsn(settings.REDIS_URL))
     yield
     logger.info("Shutting down...")
+    await app.state.redis.close()
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized POST /upload/ bodies from their Content-Length header,
+    before Starlette parses the multipart form and spools the file to disk.
+    Requests without the header (e.g., chunked) pass through to the streamed
+    byte count in upload_pdf. Plain ASGI, so other routes pay no overhead.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == "/upload/":
+            content_length = dict(scope["headers"]).get(b"content-length")
+            response = None
+            if content_length is not None:
+                if not content_length.isdigit():
+                    response = JSONResponse(status_code=400, content={"detail": "Invalid Content-Length."})
+                elif int(content_length) > self.max_body_size:
+                    response = JSONResponse(status_code=413, content={"detail": "File exceeds the maximum upload size."})
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
 
 
 app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.MAX_FILE_SIZE + settings.MAX_UPLOAD_OVERHEAD,
+)
 
-# Initialize Services
-pdf_service = PDFService()
-ai_service = CascadeService()
-normalizer = CompanyNormalizer()
-
-
-async def process_pdf_task(job_id: int, file_path: Path, db: Session):
-    """Background task to handle the AI and PDF logic without blocking the user."""
-    job = db.get(Job, job_id)
-    if not job:
-        return
-
-    try:
-        job.status = JobStatus.PROCESSING
-        db.add(job)
-        db.commit()
-
-        # 1. Extract Text (Tier 1)
-        raw_text = pdf_service.extract_text(file_path)
-
-        # 2. Render Page (For Tier 2 Fallback)
-        image_bytes = pdf_service.render_page_to_image(file_path, 0)
-
-        # 3. AI Extraction via Cascade
-        metadata, tier = await ai_service.process(
-            text=raw_text, image_bytes=image_bytes
-        )
-
-        # 4. Local Normalization
-        standardized_company = normalizer.normalize(metadata.company_name)
-
-        # 5. Create New Filename
-        new_filename = f"{standardized_company} PO{metadata.po_number} INV{metadata.invoice_number}.pdf"
-
-        # 6. Physical Split
-        output_paths = pdf_service.split_pdf(
-            source_path=file_path, page_ranges=[[0]], output_names=[new_filename]
-        )
-
-        # 7. Save to Database
-        new_invoice = Invoice(
-            job_id=job.id,
-            company_name=standardized_company,
-            po_number=metadata.po_number,
-            invoice_number=metadata.invoice_number,
-            tier_used=tier,
-            raw_text=raw_text,
-            confidence_score=metadata.confidence,
-            original_split_path=str(output_paths[0]),
-        )
-        db.add(new_invoice)
-
-        job.status = JobStatus.COMPLETED
-        db.add(job)
-        db.commit()
-        logger.info(f"Job {job_id} completed successfully.")
-
-    except Exception as e:
-        logger.error(f"Error processing job {job_id}: {e}")
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        db.add(job)
-        db.commit()
+# Job polling caches: in-flight jobs are served for up to a second,
+# finished jobs never change again and are kept until evicted
+_job_status_cache: TTLCache = TTLCache(maxsize=1024, ttl=1.0)
+_finished_job_cache: LRUCache = LRUCache(maxsize=1024)
+_FINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
 
 
 @app.post("/upload/")
 async def upload_pdf(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_session),
 ):
-    """Receives a PDF, saves it, and starts a background processing job."""
+    """Receives a PDF, saves it, and enqueues a processing job for the workers."""
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported.")
 
+    # The middleware bounds the whole request body; this enforces the limit on the
+    # file itself (already parsed and spooled by now) before copying it to UPLOAD_DIR
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail="File exceeds the maximum upload size.")
+
     temp_filename = f"{uuid.uuid4()}_{file.filename}"
     save_path = settings.UPLOAD_DIR / temp_filename
 
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Stream to disk while hashing, so the dedup key costs no extra pass over the bytes
+    hasher = hashlib.sha256()
+    written = 0
+    # Chunks larger than the file buffer bypass it and go to disk in a single write
+    async with aiofiles.open(save_path, "wb") as buffer:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > settings.MAX_FILE_SIZE:
+                break
+            hasher.update(chunk)
+            await buffer.write(chunk)
+
+    if written > settings.MAX_FILE_SIZE:
+        save_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail="File exceeds the maximum upload size.")
 
     job = Job(filename=file.filename, status=JobStatus.PENDING)
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
 
-    background_tasks.add_task(process_pdf_task, job.id, save_path, db)
+    await request.app.state.redis.enqueue_job(
+        "process_pdf_task", job.id, str(save_path), hasher.hexdigest()
+    )
 
     return {"job_id": job.id, "status": "queued", "filename": file.filename}
 
 
 @app.get("/jobs/")
-async def list_jobs(db: Session = Depends(get_session)):
-    """Returns the 20 most recent jobs."""
-    from sqlmodel import select
-
-    statement = select(Job).order_by(desc(Job.id)).limit(20)
-    results = db.exec(statement).all()
-    return results
+async def list_jobs(
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Returns the 20 most recent jobs.
+    Pass the smallest 'id' of a page as 'before_id' to fetch the next (older) page.
+    """
+    statement = select(Job)
+    if before_id is not None:
+        # Keyset pagination: a single range seek on the primary key, no OFFSET scans
+        statement = statement.where(Job.id < before_id)
+    statement = statement.order_by(desc(Job.id)).limit(20)
+    results = await db.exec(statement)
+    return results.all()
 
 
 @app.get("/jobs/{job_id}")
-async def get_job_status(job_id: int, db: Session = Depends(get_session)):
+async def get_job_status(
+    job_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_session),
+):
     """Check the status of a specific processing job."""
-    job = db.get(Job, job_id)
+    # Lets the browser coalesce rapid polls of the same job
+    response.headers["Cache-Control"] = "max-age=1, must-revalidate"
+
+    cached = _finished_job_cache.get(job_id) or _job_status_cache.get(job_id)
+    if cached is not None:
+        return cached
+
+    # Load the invoices eagerly: async sessions can't lazy-load 'job.invoices'
+    statement = (
+        select(Job).where(Job.id == job_id).options(selectinload(Job.invoices))
+    )
+    job = (await db.exec(statement)).one_or_none()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
 
-    return {
+    payload = jsonable_encoder({
         "id": job.id,
         "status": job.status,
         "created_at": job.created_at,
         "invoices": job.invoices,
         "error": job.error_message,
-    }
+    })
+
+    if job.status in _FINAL_STATUSES:
+        _finished_job_cache[job_id] = payload
+    else:
+        _job_status_cache[job_id] = payload
+    return payload
 
 
 @app.get("/health")
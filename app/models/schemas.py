@@ -1,8 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 from enum import Enum
+import msgspec
 from sqlmodel import SQLModel, Field, Relationship
 
+def _utcnow() -> datetime:
+    """Timezone-aware replacement for the deprecated datetime.utcnow()."""
+    return datetime.now(timezone.utc)
+
 class JobStatus(str, Enum):
     PENDING = "pending"
     PROCESSING = "processing"
@@ -18,8 +23,8 @@ class Job(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     filename: str
     status: JobStatus = Field(default=JobStatus.PENDING)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     error_message: Optional[str] = None
     
     # Relationship to invoices found within this job
@@ -45,6 +50,14 @@ class Invoice(SQLModel, table=True):
     
     job: Job = Relationship(back_populates="invoices")
 
+class InvoiceCache(SQLModel, table=True):
+    """Stores extraction results by PDF content hash so duplicate uploads skip the AI"""
+    content_sha256: str = Field(primary_key=True)
+    metadata_json: str  # Serialized InvoiceMetadata
+    tier_used: TierUsed
+    raw_text: Optional[str] = None
+    created_at: datetime = Field(default_factory=_utcnow)
+
 class InvoiceMetadata(SQLModel):
     """
     This is the 'Structured Output' schema we give to the AI.
@@ -53,4 +66,15 @@ class InvoiceMetadata(SQLModel):
     company_name: str = Field(description="The standardized name of the company")
     po_number: str = Field(description="The Purchase Order number")
     invoice_number: str = Field(description="The Invoice identifier")
-    confidence: float = Field(description="Score between 0 and 1 of how certain the extraction is")
\ No newline at end of file
+    confidence: float = Field(description="Score between 0 and 1 of how certain the extraction is")
+
+class InvoiceMetadataFast(msgspec.Struct):
+    """
+    Lightweight mirror of InvoiceMetadata for the post-AI hot path.
+    'instructor' still needs the pydantic model for its JSON schema; results are
+    converted to this struct once and used by the worker, normalizer and cache.
+    """
+    company_name: str
+    po_number: str
+    invoice_number: str
+    confidence: float
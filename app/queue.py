@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from arq.connections import RedisSettings
+
+from app.core.config import settings
+from app.db.session import init_db, new_session
+from app.models.schemas import Job, JobStatus, Invoice, TierUsed
+from app.services.ai.cascade import CascadeService
+from app.services.cache import ExtractionCache
+from app.services.pdf.processor import PDFService
+from app.services.normalizer import CompanyNormalizer
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+# Initialize Services (one set per worker process)
+pdf_service = PDFService()
+ai_service = CascadeService()
+normalizer = CompanyNormalizer()
+extraction_cache = ExtractionCache()
+
+
+async def process_pdf_task(
+    ctx: dict, job_id: int, file_path: str, content_sha256: Optional[str] = None
+):
+    """
+    Queue task to handle the AI and PDF logic outside the web process.
+    Opens its own database session since sessions cannot cross process boundaries.
+    'content_sha256' is normally computed during upload; it is only re-hashed if missing.
+    """
+    file_path = Path(file_path)
+    loop = asyncio.get_running_loop()
+    pool = ctx["pool"]
+
+    async with new_session() as db:
+        job = await db.get(Job, job_id)
+        if not job:
+            return
+
+        try:
+            job.status = JobStatus.PROCESSING
+            db.add(job)
+            await db.commit()
+
+            # 0. Check the Extraction Cache (duplicate uploads / retries)
+            if content_sha256 is None:
+                content_sha256 = await asyncio.to_thread(extraction_cache.file_sha256, file_path)
+            cached = await extraction_cache.get(db, content_sha256)
+
+            if cached is not None:
+                metadata, tier, raw_text = cached
+                logger.info(f"Job {job_id} matched a cached extraction; skipping AI.")
+            else:
+                # 1. Extract Text (Tier 1)
+                # PyMuPDF is CPU-bound, so it runs in the process pool to keep the loop free
+                raw_text = await loop.run_in_executor(
+                    pool, pdf_service.extract_text, file_path
+                )
+
+                # 2. Render Page (For Tier 2 Fallback)
+                # Deferred: the cascade only calls this if Tier 1 is not good enough
+                def render_page():
+                    return loop.run_in_executor(
+                        pool, pdf_service.render_page_to_image, file_path, 0
+                    )
+
+                # 3. AI Extraction via Cascade
+                metadata, tier = await ai_service.process(
+                    text=raw_text, render_fn=render_page
+                )
+                # Only cache results worth reusing: a low-confidence Tier 1 fallback
+                # (e.g., after a transient Tier 2 error) must stay retryable
+                if tier == TierUsed.TIER_2 or metadata.confidence >= ai_service.confidence_threshold:
+                    await extraction_cache.put(content_sha256, metadata, tier, raw_text)
+
+            # 4. Local Normalization
+            standardized_company = normalizer.normalize(metadata.company_name)
+
+            # 5. Create New Filename
+            new_filename = f"{standardized_company} PO{metadata.po_number} INV{metadata.invoice_number}.pdf"
+
+            # 6. Physical Split
+            # Also PyMuPDF work (insert_pdf/save), so it goes through the pool too
+            output_paths = await loop.run_in_executor(
+                pool, pdf_service.split_pdf, file_path, [[0]], [new_filename]
+            )
+
+            # 7. Save to Database
+            new_invoice = Invoice(
+                job_id=job.id,
+                company_name=standardized_company,
+                po_number=metadata.po_number,
+                invoice_number=metadata.invoice_number,
+                tier_used=tier,
+                raw_text=raw_text,
+                confidence_score=metadata.confidence,
+                original_split_path=str(output_paths[0]),
+            )
+            db.add(new_invoice)
+
+            job.status = JobStatus.COMPLETED
+            db.add(job)
+            await db.commit()
+            logger.info(f"Job {job_id} completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error processing job {job_id}: {e}")
+            # The session may hold a failed flush; clear it so the status update can commit
+            await db.rollback()
+            job.status = JobStatus.FAILED
+            job.error_message = str(e)
+            db.add(job)
+            await db.commit()
+
+
+async def startup(ctx: dict):
+    """Makes sure the tables exist and spins up the PDF rendering pool."""
+    logger.info("Starting PDFProc worker...")
+    await init_db()
+    # 'forkserver': by now the process has aiosqlite threads, which plain fork() doesn't copy safely
+    ctx["pool"] = ProcessPoolExecutor(
+        max_workers=settings.PDF_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+
+
+async def shutdown(ctx: dict):
+    """Releases the PDF rendering pool and the shared LLM connection pool."""
+    logger.info("Shutting down PDFProc worker...")
+    ctx["pool"].shutdown(wait=True)
+    await ai_service.backend.aclose()
+
+
+class WorkerSettings:
+    """
+    ARQ worker configuration.
+    Run with: arq app.queue.WorkerSettings (start several to scale out).
+    """
+    functions = [process_pdf_task]
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
+    on_startup = startup
+    on_shutdown = shutdown
+    max_jobs = settings.WORKER_MAX_JOBS
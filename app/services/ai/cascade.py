@@ -1,7 +1,9 @@
+import asyncio
 import logging
-from typing import Optional, Tuple
+import msgspec
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
 from app.services.ai.interface import get_llm_backend
-from app.models.schemas import InvoiceMetadata, TierUsed
+from app.models.schemas import InvoiceMetadata, InvoiceMetadataFast, TierUsed
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +19,36 @@ class CascadeService:
         self.backend = get_llm_backend()
         self.confidence_threshold = confidence_threshold
 
+    @staticmethod
+    def _to_fast(result: InvoiceMetadata) -> InvoiceMetadataFast:
+        """Converts the validated AI response once into the lightweight struct used downstream."""
+        return msgspec.convert(result, InvoiceMetadataFast, from_attributes=True)
+
     async def process(
         self, 
         text: str, 
-        image_bytes: Optional[bytes] = None
-    ) -> Tuple[InvoiceMetadata, TierUsed]:
+        render_fn: Optional[Callable[[], Awaitable[bytes]]] = None
+    ) -> Tuple[InvoiceMetadataFast, TierUsed]:
         """
         Main entry point for invoice extraction.
+        'render_fn' lazily produces the page image and is only awaited on Tier 2 escalation.
         Returns the data and which tier was ultimately used.
         """
-        
+        result, tier = await self._cascade(text, render_fn)
+        return self._to_fast(result), tier
+
+    async def _cascade(
+        self,
+        text: str,
+        render_fn: Optional[Callable[[], Awaitable[bytes]]]
+    ) -> Tuple[InvoiceMetadata, TierUsed]:
+        """Runs Tier 1 and, if needed, Tier 2 for a single invoice."""
         # --- Tier 1: Text-Only Extraction ---
         logger.info("Attempting Tier 1 (Text-Only) extraction...")
+        tier1_result: Optional[InvoiceMetadata] = None
         try:
             result = await self.backend.extract_invoice_data(text=text)
+            tier1_result = result
             
             if result.confidence >= self.confidence_threshold:
                 logger.info(f"Tier 1 successful with confidence {result.confidence}")
@@ -43,17 +61,29 @@ class CascadeService:
         except Exception as e:
             logger.error(f"Tier 1 extraction failed: {str(e)}. Escalating...")
 
+        return await self._tier2_fallback(tier1_result, render_fn)
+
+    async def _tier2_fallback(
+        self,
+        tier1_result: Optional[InvoiceMetadata],
+        render_fn: Optional[Callable[[], Awaitable[bytes]]]
+    ) -> Tuple[InvoiceMetadata, TierUsed]:
+        """
+        Tier 2 (Vision) extraction for a single invoice.
+        Falls back to the low-confidence Tier 1 result when vision is unavailable or fails.
+        """
         # --- Tier 2: Vision-Based Fallback ---
-        # We only attempt this if image_bytes are provided (e.g., page renders)
-        if not image_bytes:
+        # We only attempt this if a renderer is provided (e.g., page renders)
+        if render_fn is None:
             logger.error("Tier 2 escalation requested but no image data available.")
             # We return the low-confidence Tier 1 result if we can't do Tier 2
-            if 'result' in locals():
-                return result, TierUsed.TIER_1
+            if tier1_result is not None:
+                return tier1_result, TierUsed.TIER_1
             raise ValueError("Extraction failed and no image available for fallback.")
 
         logger.info("Initiating Tier 2 (Vision) extraction...")
         try:
+            image_bytes = await render_fn()
             vision_result = await self.backend.extract_invoice_data(image_bytes=image_bytes)
             logger.info("Tier 2 extraction completed.")
             return vision_result, TierUsed.TIER_2
@@ -61,6 +91,51 @@ class CascadeService:
         except Exception as e:
             logger.error(f"Tier 2 extraction failed: {str(e)}")
             # Final fallback: return the original Tier 1 result if it existed
-            if 'result' in locals():
-                return result, TierUsed.TIER_1
-            raise e
\ No newline at end of file
+            if tier1_result is not None:
+                return tier1_result, TierUsed.TIER_1
+            raise e
+
+    async def process_batch(
+        self,
+        texts: List[str],
+        render_fns: Optional[List[Optional[Callable[[], Awaitable[bytes]]]]] = None
+    ) -> List[Union[Tuple[InvoiceMetadataFast, TierUsed], BaseException]]:
+        """
+        Batched variant of process() for jobs that split into several invoices.
+        Tier 1 runs as a single request for all texts; only the invoices that
+        fail the confidence check are escalated to Tier 2 (concurrently).
+        Each position holds that invoice's (data, tier) or the exception it failed with,
+        so one bad invoice doesn't discard the others.
+        """
+        if render_fns is None:
+            render_fns = [None] * len(texts)
+        elif len(render_fns) != len(texts):
+            raise ValueError(f"Got {len(render_fns)} renderers for {len(texts)} invoices.")
+
+        # --- Tier 1: One Text-Only Request for the Whole Batch ---
+        logger.info(f"Attempting Tier 1 (Text-Only) batch extraction for {len(texts)} invoices...")
+        tier1_results: List[Optional[InvoiceMetadata]] = [None] * len(texts)
+        try:
+            tier1_results = list(await self.backend.extract_invoice_batch(texts))
+        except Exception as e:
+            logger.error(f"Tier 1 batch extraction failed: {str(e)}. Escalating...")
+
+        resolved = await asyncio.gather(*(
+            self._resolve(result, render_fn)
+            for result, render_fn in zip(tier1_results, render_fns, strict=True)
+        ), return_exceptions=True)
+        return [
+            outcome if isinstance(outcome, BaseException) else (self._to_fast(outcome[0]), outcome[1])
+            for outcome in resolved
+        ]
+
+    async def _resolve(
+        self,
+        tier1_result: Optional[InvoiceMetadata],
+        render_fn: Optional[Callable[[], Awaitable[bytes]]]
+    ) -> Tuple[InvoiceMetadata, TierUsed]:
+        """Accepts a confident Tier 1 result or falls back to Tier 2 for a single invoice."""
+        if tier1_result is not None and tier1_result.confidence >= self.confidence_threshold:
+            return tier1_result, TierUsed.TIER_1
+
+        return await self._tier2_fallback(tier1_result, render_fn)
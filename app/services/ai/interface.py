@@ -1,5 +1,8 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
+import httpx
 import instructor
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
@@ -11,6 +14,9 @@ class LLMBackend(ABC):
     Abstract Base Class for AI providers.
     Ensures both OpenAI and Anthropic return the same data structure.
     """
+    # Shared HTTP connection pool, set by providers that build one
+    http_client: Optional[httpx.AsyncClient] = None
+
     @abstractmethod
     async def extract_invoice_data(
         self, 
@@ -19,10 +25,37 @@ class LLMBackend(ABC):
     ) -> InvoiceMetadata:
         pass
 
+    async def extract_invoice_batch(self, texts: List[str]) -> List[InvoiceMetadata]:
+        """
+        Extracts several text-only invoices, preserving order.
+        Default: one concurrent request per invoice. Providers override this to use a single request.
+        """
+        return list(await asyncio.gather(
+            *(self.extract_invoice_data(text=text) for text in texts)
+        ))
+
+    async def aclose(self):
+        """Closes the HTTP connection pool; call once when the process shuts down."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+def _http_client() -> httpx.AsyncClient:
+    """Pooled HTTP client so LLM calls reuse keep-alive connections instead of new TLS handshakes."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS),
+    )
+
 class OpenAIBackend(LLMBackend):
     def __init__(self):
+        self.http_client = _http_client()
         # 'instructor' patches the client to handle Pydantic models automatically
-        self.client = instructor.from_openai(AsyncOpenAI(api_key=settings.OPENAI_API_KEY))
+        self.client = instructor.from_openai(
+            AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=self.http_client)
+        )
 
     async def extract_invoice_data(
         self, 
@@ -54,9 +87,37 @@ class OpenAIBackend(LLMBackend):
             messages=messages,
         )
 
+    async def extract_invoice_batch(self, texts: List[str]) -> List[InvoiceMetadata]:
+        # One round-trip for all invoices; delimiters let the model keep them apart
+        sections = "\n\n".join(
+            f"=== INVOICE {i} ===\n{text}" for i, text in enumerate(texts, start=1)
+        )
+        messages = [
+            {"role": "system", "content": "You are an expert invoice parser."},
+            {
+                "role": "user",
+                "content": (
+                    f"Extract invoice details for each of the {len(texts)} invoices below. "
+                    f"Return exactly one result per invoice, in the same order.\n\n{sections}"
+                ),
+            },
+        ]
+
+        results = await self.client.chat.completions.create(
+            model=settings.MODEL_A_NAME,
+            response_model=List[InvoiceMetadata],
+            messages=messages,
+        )
+        if len(results) != len(texts):
+            raise ValueError(f"Batch extraction returned {len(results)} results for {len(texts)} invoices.")
+        return results
+
 class AnthropicBackend(LLMBackend):
     def __init__(self):
-        self.client = instructor.from_anthropic(AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY))
+        self.http_client = _http_client()
+        self.client = instructor.from_anthropic(
+            AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, http_client=self.http_client)
+        )
 
     async def extract_invoice_data(
         self, 
@@ -67,8 +128,12 @@ class AnthropicBackend(LLMBackend):
         # This allows for a seamless swap in config.py
         pass
 
+@functools.cache
 def get_llm_backend() -> LLMBackend:
-    """Factory function to get the configured provider"""
+    """
+    Factory function to get the configured provider.
+    Memoized so every CascadeService in the process shares one client and connection pool.
+    """
     if settings.LLM_PROVIDER == "openai":
         return OpenAIBackend()
     elif settings.LLM_PROVIDER == "anthropic":
@@ -0,0 +1,77 @@
+import hashlib
+import logging
+import msgspec
+from pathlib import Path
+from typing import Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.db.session import new_session
+from app.models.schemas import InvoiceCache, InvoiceMetadataFast, TierUsed
+
+logger = logging.getLogger(__name__)
+
+# (metadata, tier used, raw text) as produced by a previous extraction
+CachedExtraction = Tuple[InvoiceMetadataFast, TierUsed, Optional[str]]
+
+class ExtractionCache:
+    """
+    Remembers extraction results by the SHA-256 of the PDF bytes.
+    Re-uploads of the same file (e.g., retries) skip the LLM entirely.
+    A process-local TTL cache sits in front of the 'invoicecache' table.
+    """
+
+    def __init__(self, maxsize: int = settings.CACHE_MAX_ENTRIES, ttl: int = settings.CACHE_TTL_SECONDS):
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def file_sha256(file_path: Path) -> str:
+        """Hashes a file without loading it fully into memory."""
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    async def get(self, db: AsyncSession, content_sha256: str) -> Optional[CachedExtraction]:
+        """Returns a previous result for this content, checking memory before the database."""
+        cached = self._local.get(content_sha256)
+        if cached is not None:
+            return cached
+
+        entry = await db.get(InvoiceCache, content_sha256)
+        if entry is None:
+            return None
+
+        cached = (
+            msgspec.json.decode(entry.metadata_json, type=InvoiceMetadataFast),
+            entry.tier_used,
+            entry.raw_text,
+        )
+        self._local[content_sha256] = cached
+        return cached
+
+    async def put(
+        self,
+        content_sha256: str,
+        metadata: InvoiceMetadataFast,
+        tier: TierUsed,
+        raw_text: Optional[str] = None,
+    ):
+        """
+        Persists a result in its own session and transaction.
+        Best-effort: a failed cache write is logged and never fails the caller's job.
+        """
+        # ON CONFLICT DO NOTHING: concurrent jobs for the same bytes may both miss and both insert
+        statement = insert(InvoiceCache).values(
+            content_sha256=content_sha256,
+            metadata_json=msgspec.json.encode(metadata).decode(),
+            tier_used=tier,
+            raw_text=raw_text,
+        ).on_conflict_do_nothing(index_elements=["content_sha256"])
+        try:
+            async with new_session() as db:
+                await db.exec(statement)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to cache extraction {content_sha256}: {e}")
+            return
+        self._local[content_sha256] = (metadata, tier, raw_text)
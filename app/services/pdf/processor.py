@@ -1,5 +1,7 @@
 import fitz  # PyMuPDF
 import logging
+import mmap
+import os
 from pathlib import Path
 from typing import List
 from app.core.config import settings
@@ -11,31 +13,49 @@ class PDFService:
     Handles physical PDF operations: Text extraction, Image rendering, and Splitting.
     """
 
+    @staticmethod
+    def _open_mmap(file_path: Path) -> fitz.Document:
+        """
+        Opens a PDF from a read-only memory map of the file.
+        MuPDF reads pages straight from the OS page cache instead of a separate copy.
+        """
+        fd = os.open(str(file_path), os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)  # The mapping stays valid after the descriptor is closed
+        return fitz.open(stream=memoryview(mm), filetype="pdf")
+
     @staticmethod
     def extract_text(file_path: Path) -> str:
         """Extracts all text from a PDF for Tier 1 processing."""
-        text = ""
         try:
-            with fitz.open(str(file_path)) as doc:
-                for page in doc:
-                    text += page.get_text() + "\n"
-            return text.strip()
+            with PDFService._open_mmap(file_path) as doc:
+                # Collect and join once: repeated '+=' would keep reallocating the string
+                parts = [page.get_text() for page in doc]
+            return "\n".join(parts).strip()
         except Exception as e:
             logger.error(f"Failed to extract text from {file_path}: {e}")
             return ""
 
+    @staticmethod
+    def _render_page(page: fitz.Page) -> bytes:
+        """Rasterizes a loaded page to JPEG using the configured zoom and colorspace."""
+        zoom = settings.RENDER_ZOOM
+        colorspace = fitz.csGRAY if settings.RENDER_GRAYSCALE else fitz.csRGB
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=colorspace)
+        return pix.tobytes("jpeg", jpg_quality=settings.RENDER_JPEG_QUALITY)
+
     @staticmethod
     def render_page_to_image(file_path: Path, page_index: int = 0) -> bytes:
         """
-        Renders a specific page to a high-res PNG for Tier 2 Vision.
+        Renders a specific page to a JPEG for Tier 2 Vision.
         Returns bytes for the LLM backend.
         """
         try:
-            with fitz.open(str(file_path)) as doc:
+            with PDFService._open_mmap(file_path) as doc:
                 page = doc.load_page(page_index)
-                # Zoom 2.0 (300 DPI) ensures the AI can read small font PO numbers
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                return pix.tobytes("png")
+                return PDFService._render_page(page)
         except Exception as e:
             logger.error(f"Failed to render page {page_index} for {file_path}: {e}")
             raise
@@ -48,7 +68,7 @@ class PDFService:
         """
         output_paths = []
         try:
-            with fitz.open(str(source_path)) as src:
+            with PDFService._open_mmap(source_path) as src:
                 for pages, name in zip(page_ranges, output_names):
                     new_doc = fitz.open()
                     for p in pages: